@@ -1,77 +1,383 @@
-import json, re, shutil
+import argparse, gzip, hashlib, json, os, re, shutil
 from pathlib import Path
 from html import escape
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+try:
+    import ahocorasick  # optional: pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # optional: faster JSON parse/dump
+except ImportError:
+    orjson = None
+
+try:
+    import brotli  # optional: .br files for --precompress
+except ImportError:
+    brotli = None
 
 ROOT = Path(__file__).parent
 DATA = ROOT / "data" / "entries.json"
 TPL = (ROOT / "templates" / "base.html").read_text(encoding="utf-8")
 DIST = ROOT / "dist"
 STATIC = ROOT / "static"
+CACHE = DIST / ".build-cache.json"
+
+# Template split once on its placeholders: literal segments (pre-encoded to
+# UTF-8) and the slot names between them, so render_page() is a single join.
+_TPL_FIELDS = {"TITLE", "SIDEBAR", "CATEGORIES_SIDEBAR", "CONTENT"}
+_TPL_PARTS = re.split(r"\{\{(\w+)\}\}", TPL)
+_TPL_SEGMENTS = [seg.encode("utf-8") for seg in _TPL_PARTS[0::2]]
+_TPL_SLOTS = _TPL_PARTS[1::2]
+if not _TPL_FIELDS.issuperset(_TPL_SLOTS):
+    raise ValueError(f"base.html: unknown placeholders {sorted(set(_TPL_SLOTS) - _TPL_FIELDS)}")
+
+# slugify：危險字元刪除表（模組載入時建立一次）
+_SLUG_DELETE = str.maketrans("", "", '/\\?#%:|"<>.')
+
+# List row templates, filled with % (url, escaped text, ...)
+_SIDE_ITEM = '<div class="side-item"><a href="%s">%s</a> <span class="muted">(%d)</span></div>'
+_CAT_INDEX_ITEM = '<li><a href="%s">%s</a> — <span class="muted">%d 條</span></li>'
+_HOME_ITEM = '<li>%s — %s</li>'
+
+# 團體詞條內文的成員名單：「由A、B、C...和D組成」
+_GROUP_MEMBERS_RE = re.compile(r"由(.+?)組成")
+
+def entry_categories(e):
+    """All categories of an entry, cleaned; 未分類 when it has none."""
+    cats = e.get("categories") or "未分類"
+    if isinstance(cats, str):
+        cats = (cats,)
+    cats = [s for s in (str(c).strip() for c in cats if c) if s]
+    return cats or ["未分類"]
 
 def slugify(title: str) -> str:
-    # 保留中文，去掉危險字元，空白改成 -
-    s = title.strip()
-    s = re.sub(r"[\/\\\?\#\%\:\|\"<>\.]", "", s)
-    s = re.sub(r"\s+", "-", s)
-    return s
+    # 保留中文，去掉危險字元，連續空白改成一個 -
+    s = title.strip().translate(_SLUG_DELETE)
+    words = s.split()
+    if not words:
+        return "-" if s else ""
+    slug = "-".join(words)
+    # 刪字元後兩端留下的空白同樣變成 -（與舊的 \s+ → - 結果一致）
+    if s[0].isspace():
+        slug = "-" + slug
+    if s[-1].isspace():
+        slug += "-"
+    return slug
+
+def load_cache():
+    """Return the previous build's cache, or None to force a full rebuild."""
+    try:
+        return json.loads(CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def search_entry_text(e, rx):
+    """Search an entry's summary, then each content paragraph, in order.
+
+    Returns the first match without concatenating the whole entry text.
+    """
+    m = rx.search(e.get("summary", ""))
+    if m:
+        return m
+    for p in e.get("content") or ():
+        m = rx.search(p or "")
+        if m:
+            return m
+    return None
 
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
-def linkify(text: str, title_to_url: dict):
-    """Replace entry titles with hyperlinks in plain text.
+def copy_static(src, dst, stamps, old_stamps, copied=None, prefix=""):
+    """Recursively copy file contents from src into dst, skipping unchanged files.
 
-    Single-pass implementation to avoid nested <a> tags when one title is a
-    substring of another (e.g. 胡亞尼 vs 胡亞尼（作者）).
+    Each source file's (size, mtime_ns) is recorded in `stamps` under its
+    path relative to dst. A file is copied when the target is missing or the
+    stamp differs from `old_stamps` (the previous build's), so restoring an
+    older asset is copied too; target paths actually copied are appended to
+    `copied` when given. os.scandir gets file types from the directory
+    listing without extra stat calls, and shutil.copyfile uses sendfile()
+    where available. Metadata is not preserved: nothing in dist/ needs it.
+    """
+    ensure_dir(Path(dst))
+    with os.scandir(src) as it:
+        for entry in it:
+            target = os.path.join(dst, entry.name)
+            rel = prefix + entry.name
+            if entry.is_dir():
+                copy_static(entry.path, target, stamps, old_stamps, copied, rel + "/")
+            elif entry.is_file():
+                st = entry.stat()
+                stamp = stamps[rel] = [st.st_size, st.st_mtime_ns]
+                if old_stamps.get(rel) == stamp and os.path.exists(target):
+                    continue
+                shutil.copyfile(entry.path, target)
+                if copied is not None:
+                    copied.append(target)
+
+def make_linkify(title_anchor: dict):
+    """Build linkify(text) for a fixed title → prebuilt <a> tag map.
+
+    The title matcher (longest title first) is prepared once here, so the
+    returned function only scans the text.
+    With pyahocorasick installed the matcher is an Aho-Corasick automaton,
+    whose scan cost does not grow with the number of titles; otherwise it is
+    one regex alternation. Both pick the same matches.
     """
-    keys = sorted(title_to_url.keys(), key=len, reverse=True)
+    keys = sorted(title_anchor.keys(), key=len, reverse=True)
     if not keys:
-        return escape(text)
-
-    pattern = re.compile("|".join(re.escape(k) for k in keys))
-
-    out = []
-    last = 0
-    for m in pattern.finditer(text):
-        out.append(escape(text[last:m.start()]))
-        k = m.group(0)
-        url = title_to_url.get(k)
-        if url:
-            out.append(f'<a href="{url}">{escape(k)}</a>')
+        return escape
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for k in keys:
+            automaton.add_word(k, len(k))
+        automaton.make_automaton()
+
+        def find_titles(text):
+            # Same choice as the regex: leftmost start, longest title there,
+            # then continue after it.
+            longest = {}
+            for end, n in automaton.iter(text):
+                start = end - n + 1
+                if n > longest.get(start, 0):
+                    longest[start] = n
+            spans = []
+            last = 0
+            for start in sorted(longest):
+                if start >= last:
+                    last = start + longest[start]
+                    spans.append((start, last))
+            return spans
+    else:
+        finditer = re.compile("|".join(re.escape(k) for k in keys)).finditer
+
+        def find_titles(text):
+            return [m.span() for m in finditer(text)]
+
+    def linkify(text: str) -> str:
+        """Replace entry titles with hyperlinks in plain text.
+
+        Single-pass implementation to avoid nested <a> tags when one title is a
+        substring of another (e.g. 胡亞尼 vs 胡亞尼（作者）).
+        """
+        out = []
+        last = 0
+        for start, end in find_titles(text):
+            out.append(escape(text[last:start]))
+            out.append(title_anchor[text[start:end]])
+            last = end
+
+        out.append(escape(text[last:]))
+        return "".join(out)
+
+    return linkify
+
+def render_page(title, sidebar: bytes, categories_sidebar: bytes, body_html) -> bytes:
+    """Fill the page template; returns the UTF-8 encoded page.
+
+    The sidebars are identical on every page, so callers pass them already
+    encoded once per build.
+    """
+    subs = {
+        "TITLE": escape(title).encode("utf-8"),
+        "SIDEBAR": sidebar,
+        "CATEGORIES_SIDEBAR": categories_sidebar,
+        "CONTENT": body_html.encode("utf-8"),
+    }
+    return b"".join(seg + subs[slot] for seg, slot in zip(_TPL_SEGMENTS, _TPL_SLOTS)) + _TPL_SEGMENTS[-1]
+
+# Entry pages are rendered in worker processes once the wiki is big enough for
+# the pool start-up cost to pay off; below that a plain loop is faster.
+PARALLEL_MIN_ENTRIES = 500
+
+# Threads used to write rendered pages to disk.
+WRITE_WORKERS = 32
+
+# Text assets that get .gz/.br siblings with --precompress.
+PRECOMPRESS_SUFFIXES = {".html", ".json", ".css", ".js", ".svg"}
+
+# Per-build state for render_entry(), set by _init_render() in the main process
+# or once in each pool worker.
+_RENDER = {}
+
+def _init_render(ctx: dict):
+    _RENDER.clear()
+    _RENDER.update(ctx)
+    # Compiled pattern and closure are rebuilt here rather than pickled.
+    _RENDER["linkify"] = make_linkify(ctx["title_anchor"])
+
+def render_entry(e):
+    """Render one entry page; returns (output path, UTF-8 encoded HTML)."""
+    title_escaped = _RENDER["title_escaped"]
+    title_anchor = _RENDER["title_anchor"]
+    cat_to_url = _RENDER["cat_to_url"]
+    cat_escaped = _RENDER["cat_escaped"]
+    linkify = _RENDER["linkify"]
+
+    slug = _RENDER["title_to_slug"][e["title"]]
+    out_dir = DIST / "pages" / slug
+
+    h1 = f"<h1>{title_escaped[e['title']]}</h1>"
+    summary = f"<p class='muted'>{_RENDER['summary_escaped'][e['title']]}</p>" if e.get("summary") else ""
+
+    alias = ""
+    if e.get("aliases"):
+        alias = "<p><strong>別名：</strong> " + ", ".join(escape(a) for a in e["aliases"]) + "</p>"
+
+    # Page body is one flat list of fragments, joined once at the end.
+    parts = [h1, summary, alias, "<h2>內容</h2>"]
+    n_head = len(parts)
+    for p in e.get("content", []):
+        p = (p or "").strip()
+        if not p:
+            continue
+        if p.startswith("<"):
+            # raw HTML block (e.g. infobox image)
+            parts.append(p)
         else:
-            out.append(escape(k))
-        last = m.end()
+            parts.append(f"<p>{linkify(p)}</p>")
+    if len(parts) == n_head:
+        parts.append("<p class='muted'>（此詞條尚待補完）</p>")
+
+    see = ""
+    if e.get("see_also"):
+        links = []
+        for t in e["see_also"]:
+            if t in title_anchor:
+                links.append(title_anchor[t])
+            else:
+                links.append(escape(t))
+        see = "<h2>參見</h2><p>" + " · ".join(links) + "</p>"
+    parts.append(see)
 
-    out.append(escape(text[last:]))
-    return "".join(out)
+    cat = e.get("categories") or "未分類"
+    if isinstance(cat, list):
+        cat = cat[0] if cat else "未分類"
+    cat = str(cat).strip() or "未分類"
+    cat_link = f'<a href="{cat_to_url.get(cat, "/categories/")}">{cat_escaped.get(cat) or escape(cat)}</a>'
+    parts.append("<h2>分類</h2><p>" + cat_link + "</p>")
 
+    page = render_page(e["title"], _RENDER["sidebar"], _RENDER["categories_sidebar"], "\n".join(parts))
+    return out_dir / "index.html", page
 
-def render_page(title, sidebar_html, categories_sidebar_html, body_html):
-    html = TPL.replace("{{TITLE}}", escape(title))
-    html = html.replace("{{SIDEBAR}}", sidebar_html)
-    html = html.replace("{{CATEGORIES_SIDEBAR}}", categories_sidebar_html)
-    html = html.replace("{{CONTENT}}", body_html)
-    return html
+def remove_tree(path):
+    """Delete a directory tree; a missing path is not an error.
 
-def build():
-    entries = json.loads(DATA.read_text(encoding="utf-8"))
+    Leaner than shutil.rmtree for dist/: file types come from the scandir
+    listing (no per-entry stat), and links are unlinked, never followed.
+    """
+    try:
+        it = os.scandir(path)
+    except FileNotFoundError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                remove_tree(entry.path)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(path)
 
-    # URL map
-    title_to_slug = {e["title"]: slugify(e["title"]) for e in entries}
-    title_to_url = {t: f"/pages/{s}/" for t, s in title_to_slug.items()}
+def make_dirs(paths):
+    """Create each directory in paths; their parents must already exist.
 
-    # --- Categories ---
-    cat_to_titles = defaultdict(list)
+    Used to create all output directories up front, so the render/write loops
+    do not stat and mkdir once per page.
+    """
+    for p in paths:
+        try:
+            os.mkdir(p)
+        except FileExistsError:
+            pass
+
+def write_file(path, data: bytes):
+    """Write bytes to path with raw os.open/os.write (no TextIOWrapper)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _write_page(task):
+    write_file(*task)
+
+def write_pages(pages):
+    """Write (path, bytes) pairs from a thread pool; directories must exist.
+
+    Each write is open/write/close syscalls that release the GIL, so the
+    threads overlap them instead of queueing one file after another.
+    """
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as ex:
+        list(ex.map(_write_page, pages))
+
+def _compress_file(path):
+    data = Path(path).read_bytes()
+    write_file(path + ".gz", gzip.compress(data, 9, mtime=0))
+    if brotli is not None:
+        write_file(path + ".br", brotli.compress(data, quality=11))
+
+def precompress(paths):
+    """Write .gz (and .br if brotli is installed) next to each written text file.
+
+    `paths` are the files this build wrote, so unchanged pages keep the
+    siblings compressed from them earlier. zlib and brotli release the GIL,
+    so a thread pool spreads the work over all cores.
+    """
+    todo = [str(p) for p in paths if os.path.splitext(p)[1] in PRECOMPRESS_SUFFIXES]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as ex:
+        list(ex.map(_compress_file, todo))
+    return len(todo)
+
+def build(force: bool = False, compress: bool = False):
+    # Parsed straight from bytes: both parsers take UTF-8 input as-is, so no
+    # decoded copy of the whole file is made first.
+    raw = DATA.read_bytes()
+    entries = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    # One walk over the entries collects everything keyed on a single entry:
+    # lookup, slug and URL map, escaped summary, search-index row and
+    # category pairs.
+    title_to_entry, title_to_slug, title_to_url, summary_escaped = {}, {}, {}, {}
+    search_index, cat_pairs = [], []
     for e in entries:
-        cats = e.get("categories") or "未分類"
-        if isinstance(cats, str):
-            cats = [cats]
-        cats = [str(c).strip() for c in cats if c and str(c).strip()]
-        if not cats:
-            cats = ["未分類"]
-        for c in cats:
-            cat_to_titles[c].append(e["title"])
+        t = e["title"]
+        s = slugify(t)
+        summary = e.get("summary", "")
+        title_to_entry[t] = e
+        title_to_slug[t] = s
+        title_to_url[t] = f"/pages/{s}/"
+        summary_escaped[t] = escape(summary)
+        search_index.append({
+            "title": t,
+            "aliases": e.get("aliases", []),
+            "summary": summary,
+            "url": title_to_url[t],
+        })
+        cat_pairs.extend((c, t) for c in entry_categories(e))
+
+    # The one title collation of the build (codepoint order). Every other
+    # title list is ordered by rank, so changing collation only touches here.
+    titles_sorted = sorted(title_to_url)
+    title_rank = {t: i for i, t in enumerate(titles_sorted)}
+    # Escaped titles/summaries are reused by every page that lists or links them.
+    title_escaped = {t: escape(t) for t in title_to_url}
+    title_anchor = {t: f'<a href="{u}">{title_escaped[t]}</a>' for t, u in title_to_url.items()}
+    title_li = {t: f"<li>{a}</li>" for t, a in title_anchor.items()}
+    title_row = {t: f'<div class="cat-row">{a}</div>' for t, a in title_anchor.items()}
+
+    # --- Categories ---
+    # One sort of (category, title rank) pairs gives every category's titles
+    # in order; groupby then splits them without per-category sorts.
+    rows = sorted((c, title_rank[t]) for c, t in cat_pairs)
+    cat_to_titles = {c: [titles_sorted[r] for _, r in g] for c, g in groupby(rows, key=itemgetter(0))}
 
         # Custom category order (manual priority)
     CATEGORY_ORDER = [
@@ -94,126 +400,163 @@ def build():
     order = {name: i for i, name in enumerate(CATEGORY_ORDER)}
 
     categories_sorted = sorted(cat_to_titles.keys(), key=lambda c: (order.get(c, 999), c))
-    for c in categories_sorted:
-        cat_to_titles[c] = sorted(cat_to_titles[c])
 
     cat_to_url = {c: f"/categories/{slugify(c)}/" for c in categories_sorted}
+    cat_escaped = {c: escape(c) for c in categories_sorted}
 
-    categories_sidebar_html = "\n".join(
-        f'<div class="side-item"><a href="{cat_to_url[c]}">{escape(c)}</a> '
-        f'<span class="muted">({len(cat_to_titles[c])})</span></div>'
+    categories_sidebar_html = "\n".join([
+        _SIDE_ITEM % (cat_to_url[c], cat_escaped[c], len(cat_to_titles[c]))
         for c in categories_sorted
-    )
+    ])
 
     # 右邊 sidebar：只顯示分類
     sidebar_html = ""
-
-    # Clean dist
-    if DIST.exists():
-        shutil.rmtree(DIST)
+    sidebar = sidebar_html.encode("utf-8")
+    categories_sidebar = categories_sidebar_html.encode("utf-8")
+
+    # Incremental build: reuse dist/ and skip entry and category pages whose
+    # inputs are unchanged. Anything shared by every page (template, sidebars,
+    # URL maps, this script) goes into site_key, so changing it rebuilds all
+    # pages; the categories index depends on nothing else.
+    cache = None if force else load_cache()
+    # Compressed siblings exist only for the mode they were built with; a
+    # different mode (flag toggled, brotli installed/removed) rebuilds from a
+    # clean dist/ so no .gz/.br of an older page survives.
+    compress_mode = ("gzip+br" if brotli is not None else "gzip") if compress else ""
+    if cache is not None and cache.get("compress", "") != compress_mode:
+        cache = None
+    site_key = hashlib.sha256("\0".join([
+        TPL,
+        Path(__file__).read_text(encoding="utf-8"),
+        sidebar_html,
+        categories_sidebar_html,
+        json.dumps(title_to_url, ensure_ascii=False, sort_keys=True),
+        json.dumps(cat_to_url, ensure_ascii=False, sort_keys=True),
+    ]).encode("utf-8")).digest()
+    page_keys = {
+        title_to_slug[e["title"]]: hashlib.sha256(
+            json.dumps(e, ensure_ascii=False, sort_keys=True).encode("utf-8") + site_key
+        ).hexdigest()
+        for e in entries
+    }
+    cat_to_slug = {c: slugify(c) for c in categories_sorted}
+    cat_keys = {
+        cat_to_slug[c]: hashlib.sha256(
+            json.dumps([c, cat_to_titles[c]], ensure_ascii=False).encode("utf-8") + site_key
+        ).hexdigest()
+        for c in categories_sorted
+    }
+    cat_keys[""] = site_key.hex()  # categories index page
+
+    # Clean dist（全量建置時）
+    if cache is None:
+        remove_tree(DIST)
+        cache = {}
+    else:
+        # Drop pages of removed/renamed entries and categories.
+        for slug in set(cache.get("pages", {})) - set(page_keys):
+            remove_tree(DIST / "pages" / slug)
+        for slug in set(cache.get("categories", {})) - set(cat_keys):
+            remove_tree(DIST / "categories" / slug)
+        # The cache is only valid for a finished build: drop it before any
+        # page is written, so an interrupted run falls back to a full rebuild.
+        CACHE.unlink(missing_ok=True)
     ensure_dir(DIST)
     # Copy static (recursive; supports subfolders like static/images/)
+    written = []  # files written by this build, for --precompress
+    # Source (size, mtime_ns) per asset, keyed by its path under dist/.
+    static_files = {}
+    old_static = cache.get("static", {})
+    if not isinstance(old_static, dict):  # older cache: a plain path list
+        old_static = dict.fromkeys(old_static)
     if STATIC.exists():
-        for p in STATIC.rglob("*"):
-            rel = p.relative_to(STATIC)
-            dest = DIST / rel
-            if p.is_dir():
-                ensure_dir(dest)
-            else:
-                ensure_dir(dest.parent)
-                shutil.copy2(p, dest)
-
-    # Search index
-    search_index = []
-    for e in entries:
-        search_index.append({
-            "title": e["title"],
-            "title_lc": e["title"].lower(),
-            "aliases": e.get("aliases", []),
-            "aliases_lc": [a.lower() for a in e.get("aliases", [])],
-            "summary": e.get("summary", ""),
-            "url": title_to_url[e["title"]],
-        })
-    (DIST / "search-index.json").write_text(
-        json.dumps(search_index, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+        copy_static(STATIC, DIST, static_files, old_static, written)
+    # Assets deleted from static/ since the last build (with their siblings).
+    for rel in set(old_static) - set(static_files):
+        for suffix in ("", ".gz", ".br"):
+            (DIST / (rel + suffix)).unlink(missing_ok=True)
+
+    # Search index (rows collected in the entry walk above), compact since it
+    # is machine-read only. With orjson it is queued in site_pages, which the
+    # category pages and home join later, all written together by the writer
+    # threads; the stdlib fallback streams it to disk right away instead.
+    site_pages = []
+    if orjson is not None:
+        site_pages.append((DIST / "search-index.json", orjson.dumps(search_index)))
+    else:
+        with open(DIST / "search-index.json", "w", encoding="utf-8", buffering=1 << 20) as f:
+            json.dump(search_index, f, ensure_ascii=False, separators=(",", ":"))
+        written.append(DIST / "search-index.json")
 
     # Entry pages
-    for e in entries:
-        slug = title_to_slug[e["title"]]
-        out_dir = DIST / "pages" / slug
-        ensure_dir(out_dir)
-
-        h1 = f"<h1>{escape(e['title'])}</h1>"
-        summary = f"<p class='muted'>{escape(e.get('summary',''))}</p>" if e.get("summary") else ""
-
-        alias = ""
-        if e.get("aliases"):
-            alias = "<p><strong>別名：</strong> " + ", ".join(escape(a) for a in e["aliases"]) + "</p>"
-
-        paras = []
-        for p in e.get("content", []):
-            p = (p or "").strip()
-            if not p:
-                continue
-            if p.startswith("<"):
-                # raw HTML block (e.g. infobox image)
-                paras.append(p)
-            else:
-                paras.append(f"<p>{linkify(p, title_to_url)}</p>")
-        content_html = "\n".join(paras) if paras else "<p class='muted'>（此詞條尚待補完）</p>"
-
-        see = ""
-        if e.get("see_also"):
-            links = []
-            for t in e["see_also"]:
-                if t in title_to_url:
-                    links.append(f'<a href="{title_to_url[t]}">{escape(t)}</a>')
-                else:
-                    links.append(escape(t))
-            see = "<h2>參見</h2><p>" + " · ".join(links) + "</p>"
-
-        cat = e.get("categories") or "未分類"
-        if isinstance(cat, list):
-            cat = cat[0] if cat else "未分類"
-        cat = str(cat).strip() or "未分類"
-        cat_link = f'<a href="{cat_to_url.get(cat, "/categories/")}">{escape(cat)}</a>'
-        cat_block = "<h2>分類</h2><p>" + cat_link + "</p>"
-
-        body = "\n".join([h1, summary, alias, "<h2>內容</h2>", content_html, see, cat_block])
-        page = render_page(e["title"], sidebar_html, categories_sidebar_html, body)
-        (out_dir / "index.html").write_text(page, encoding="utf-8")
+    # Entries sharing a slug (same title, or titles that slugify alike) share
+    # one page. Only the last of them is rendered, so no two writer threads
+    # truncate the same file and the last entry wins, as before.
+    old_keys = cache.get("pages", {})
+    page_entries = {title_to_slug[e["title"]]: e for e in entries}
+    stale = [
+        e for slug, e in page_entries.items()
+        if old_keys.get(slug) != page_keys[slug]
+        or not (DIST / "pages" / slug / "index.html").exists()
+    ]
+    render_ctx = {
+        "title_to_slug": title_to_slug,
+        "title_escaped": title_escaped,
+        "title_anchor": title_anchor,
+        "summary_escaped": summary_escaped,
+        "cat_to_url": cat_to_url,
+        "cat_escaped": cat_escaped,
+        "sidebar": sidebar,
+        "categories_sidebar": categories_sidebar,
+    }
+    ensure_dir(DIST / "pages")
+    make_dirs({DIST / "pages" / title_to_slug[e["title"]] for e in stale})
+    written.extend(DIST / "pages" / title_to_slug[e["title"]] / "index.html" for e in stale)
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(stale) >= PARALLEL_MIN_ENTRIES:
+        chunksize = max(1, len(stale) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render,
+                                 initargs=(render_ctx,)) as ex:
+            # Pages are handed to the writer threads as each chunk comes back,
+            # so disk writes overlap with rendering in the workers.
+            write_pages(ex.map(render_entry, stale, chunksize=chunksize))
+    else:
+        _init_render(render_ctx)
+        write_pages(render_entry(e) for e in stale)
 
     # Category pages
     cat_root = DIST / "categories"
+    old_cat_keys = cache.get("categories", {})
+    stale_cats = {
+        slug for slug, key in cat_keys.items()
+        if old_cat_keys.get(slug) != key or not (cat_root / slug / "index.html").exists()
+    }
     ensure_dir(cat_root)
+    make_dirs({cat_root / slug for slug in stale_cats if slug})
 
     # categories index
-    cat_list_items = []
-    for c in categories_sorted:
-        cat_list_items.append(
-            f'<li><a href="{cat_to_url[c]}">{escape(c)}</a> — '
-            f'<span class="muted">{len(cat_to_titles[c])} 條</span></li>'
-        )
+    cat_list_items = [
+        _CAT_INDEX_ITEM % (cat_to_url[c], cat_escaped[c], len(cat_to_titles[c]))
+        for c in categories_sorted
+    ]
     cat_index_body = (
         "<h1>分類</h1>"
         "<p class='muted'>按分類瀏覽詞條。</p>"
         "<ul>" + "\n".join(cat_list_items) + "</ul>"
     )
-    (cat_root / "index.html").write_text(
-        render_page("分類", sidebar_html, categories_sidebar_html, cat_index_body),
-        encoding="utf-8"
-    )
+    if "" in stale_cats:
+        site_pages.append((
+            cat_root / "index.html",
+            render_page("分類", sidebar, categories_sidebar, cat_index_body),
+        ))
 
     # 人物：偶像團體成員名單
     # 來源優先：從「Virgo」「Virtus」詞條內文解析「由A、B、C...和D組成」的名單；若解析失敗才回退到硬編碼。
     def parse_group_members(group_title: str):
-        e = next((x for x in entries if x.get("title") == group_title), None)
+        e = title_to_entry.get(group_title)
         if not e:
             return None
-        text = " ".join([e.get("summary","")] + (e.get("content") or []))
-        m = re.search(r"由(.+?)組成", text)
+        m = search_entry_text(e, _GROUP_MEMBERS_RE)
         if not m:
             return None
         names_blob = m.group(1)
@@ -239,11 +582,12 @@ def build():
 
 
     for c in categories_sorted:
-        out_dir = cat_root / slugify(c)
-        ensure_dir(out_dir)
+        if cat_to_slug[c] not in stale_cats:
+            continue
+        out_dir = cat_root / cat_to_slug[c]
         if c == "人物":
             parts = [
-                f"<h1>分類：{escape(c)}</h1>",
+                f"<h1>分類：{cat_escaped[c]}</h1>",
                 f"<p class='muted'>共 {len(cat_to_titles[c])} 條</p>",
             ]
 
@@ -255,9 +599,9 @@ def build():
             titles = list(cat_to_titles.get(c, []))
             present = set(titles)
 
-            # Use <div> rows instead of <ul><li> to avoid bullet points
-            def row(t: str) -> str:
-                return f'<div class="cat-row"><a href="{title_to_url[t]}">{escape(t)}</a></div>'
+            # Use <div> rows instead of <ul><li> to avoid bullet points.
+            # Rows go straight into parts (one flat list, joined once).
+            row = title_row.__getitem__
 
             used = set()
 
@@ -267,7 +611,7 @@ def build():
                 used.update(virgo)
                 parts.append("<h2>Virgo</h2>")
                 parts.append('<div class="cat-list">')
-                parts.append("\n".join(row(t) for t in virgo))
+                parts.extend(map(row, virgo))
                 parts.append("</div>")
 
             # Virtus section
@@ -276,43 +620,42 @@ def build():
                 used.update(virtus)
                 parts.append("<h2>Virtus</h2>")
                 parts.append('<div class="cat-list">')
-                parts.append("\n".join(row(t) for t in virtus))
+                parts.extend(map(row, virtus))
                 parts.append("</div>")
 
             # Others section: explicit importance order first, then remaining alphabetically
             others_main = [t for t in other_order if t in present and t not in used]
             used.update(others_main)
-            others_rest = sorted([t for t in titles if t not in used])
+            others_rest = sorted([t for t in titles if t not in used], key=title_rank.__getitem__)
 
             others = others_main + others_rest
             if others:
                 parts.append("<h2>其他人物</h2>")
                 parts.append('<div class="cat-list">')
-                parts.append("\n".join(row(t) for t in others))
+                parts.extend(map(row, others))
                 parts.append("</div>")
 
             body = "\n".join(parts)
 
         else:
 
-            items = [f'<li><a href="{title_to_url[t]}">{escape(t)}</a></li>' for t in cat_to_titles[c]]
+            items = [title_li[t] for t in cat_to_titles[c]]
             body = (
-                f"<h1>分類：{escape(c)}</h1>"
+                f"<h1>分類：{cat_escaped[c]}</h1>"
                 f"<p class='muted'>共 {len(cat_to_titles[c])} 條</p>"
                 "<h2>詞條</h2>"
                 "<ul>" + "\n".join(items) + "</ul>"
             )
 
-        (out_dir / "index.html").write_text(
-            render_page(f"分類：{c}", sidebar_html, categories_sidebar_html, body),
-            encoding="utf-8"
-        )
+        site_pages.append((
+            out_dir / "index.html",
+            render_page(f"分類：{c}", sidebar, categories_sidebar, body),
+        ))
 
     # Home
-    entries_sorted = sorted(entries, key=lambda x: x["title"])
     home_list = [
-        f'<li><a href="{title_to_url[e["title"]]}">{escape(e["title"])}</a> — {escape(e.get("summary",""))}</li>'
-        for e in entries_sorted
+        _HOME_ITEM % (title_anchor[t], summary_escaped[t])
+        for t in titles_sorted
     ]
     home_body = (
         "<h1>佩洛瑪舞台：百科</h1>"
@@ -322,12 +665,40 @@ def build():
         "<h2>詞條列表</h2>"
         "<ul>" + "\n".join(home_list) + "</ul>"
     )
-    (DIST / "index.html").write_text(
-        render_page("佩洛瑪舞台：百科", sidebar_html, categories_sidebar_html, home_body),
-        encoding="utf-8"
+    site_pages.append((
+        DIST / "index.html",
+        render_page("佩洛瑪舞台：百科", sidebar, categories_sidebar, home_body),
+    ))
+    # Categories that slugify alike map to one path: keep the last page.
+    site_pages = dict(site_pages)
+    write_pages(site_pages.items())
+    written.extend(site_pages)
+
+    if compress:
+        print(f"Precompressed {precompress(written)} files")
+
+    CACHE.write_text(
+        json.dumps(
+            {
+                "pages": page_keys,
+                "categories": cat_keys,
+                "static": dict(sorted(static_files.items())),
+                "compress": compress_mode,
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
     )
 
-    print("Build complete -> dist/")
+    print(
+        f"Build complete -> dist/ ({len(stale)}/{len(page_entries)} entry pages, "
+        f"{len(stale_cats)}/{len(cat_keys)} category pages rendered)"
+    )
 
 if __name__ == "__main__":
-    build()
+    ap = argparse.ArgumentParser(description="Build the static wiki into dist/.")
+    ap.add_argument("--force", action="store_true", help="wipe dist/ and rebuild every page")
+    ap.add_argument("--precompress", action="store_true",
+                    help="also write .gz (and .br with brotli installed) for text assets")
+    args = ap.parse_args()
+    build(force=args.force, compress=args.precompress)
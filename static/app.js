@@ -13,6 +13,11 @@ function escapeHtml(s) {
   if (!box || !results) return;
 
   const index = await loadIndex();
+  // Lowercased copies for matching are derived once here, not shipped in the JSON.
+  for (const it of index) {
+    it.title_lc = it.title.toLowerCase();
+    it.aliases_lc = (it.aliases || []).map(a => a.toLowerCase());
+  }
 
   function render(list) {
     if (!list.length) { results.style.display = "none"; results.innerHTML = ""; return; }